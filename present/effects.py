@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+import os
 from random import randint, choice
 
 from asciimatics.effects import Print
@@ -122,11 +123,15 @@ def _base(screen, element, row, fg_color, bg_color):
 
 
 def _image(screen, element, row, bg_color):
+    src = element.obj["src"]
+    if not os.path.exists(src):
+        raise FileNotFoundError(f"{src} does not exist")
+
     image = Print(
         screen,
         ColourImageFile(
             screen,
-            element.obj["src"],
+            src,
             element.size,
             bg=bg_color,
             fill_background=True,
@@ -4,39 +4,90 @@ import os
 import re
 import sys
 import shutil
+import functools
 from dataclasses import dataclass
 
+try:
+    from functools import cached_property
+except ImportError:  # Python 3.7
+    cached_property = property
+
 import yaml
 from pyfiglet import Figlet
 
+try:
+    from yaml import CSafeLoader as _YAMLLoader
+except ImportError:
+    from yaml import SafeLoader as _YAMLLoader
+
 from ._vendor.mistune import markdown
 from .effects import EFFECTS, COLORMAP
 
 
+_FIGLET = Figlet()
+_STYLE_RE = re.compile(r"(\w+)=(\w+)")
+
+
+@functools.lru_cache(maxsize=256)
+def _figlet_render(text):
+    return _FIGLET.renderText(text)
+
+
+@functools.lru_cache(maxsize=128)
+def _dash(n):
+    return "-" * n
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_ast(text):
+    # elements only read the AST, so slides can be rebuilt from a shared copy
+    return markdown(text, renderer="ast")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_codio(path):
+    with open(path, "r") as f:
+        return yaml.load(f, Loader=_YAMLLoader)
+
+
+@functools.lru_cache(maxsize=1)
+def _term_size():
+    return shutil.get_terminal_size()
+
+
+def reset_terminal_size():
+    """Forget the cached terminal size. The slideshow calls this when the
+    screen is resized.
+    """
+    _term_size.cache_clear()
+
+
 @dataclass
 class Heading(object):
     type: str = "heading"
     obj: dict = None
 
-    @property
+    def __post_init__(self):
+        self._text = self.obj["children"][0]["text"]
+        self._level = self.obj["level"]
+
+    @cached_property
     def size(self):
-        if self.obj["level"] == 1:
-            f = Figlet()
-            text = self.obj["children"][0]["text"]
-            return len(f.renderText(text).splitlines())
-        elif self.obj["level"] == 2:
+        if self._level == 1:
+            # figlet output always ends with a newline
+            return _figlet_render(self._text).count("\n")
+        elif self._level == 2:
             return 2
         else:
             return 1
 
     def render(self):
-        text = self.obj["children"][0]["text"]
+        text = self._text
 
-        if self.obj["level"] == 1:
-            f = Figlet()
-            return f.renderText(text)
-        elif self.obj["level"] == 2:
-            return "\n".join([text, "-" * len(text)])
+        if self._level == 1:
+            return _figlet_render(text)
+        elif self._level == 2:
+            return "\n".join((text, _dash(len(text))))
         else:
             return text
 
@@ -63,21 +114,27 @@ class List(object):
         if text is None:
             text = []
 
-        for child in obj.get("children", []):
+        stack = [(child, level) for child in reversed(obj.get("children", []))]
+        while stack:
+            child, level = stack.pop()
             if child.get("text") is not None:
                 text.append((" " * 2 * level) + "• " + child["text"])
 
-            if "children" in obj:
-                self.walk(child, text=text, level=level + 1)
+            if "children" in child:
+                stack.extend((c, level + 1) for c in reversed(child["children"]))
 
         return text
 
+    @cached_property
+    def _lines(self):
+        return self.walk(self.obj)
+
     @property
     def size(self):
-        return len(self.walk(self.obj))
+        return len(self._lines)
 
     def render(self):
-        return "\n".join(self.walk(self.obj))
+        return "\n".join(self._lines)
 
 
 @dataclass
@@ -91,15 +148,13 @@ class BlockCode(object):
         max_len = max(len(l) for l in lines)
         top = bottom = " " * (max_len + 2)
 
-        lines = [l.ljust(max_len + 1, fill) for l in lines]
-        lines = [" " + l for l in lines]
-        lines.insert(0, top)
-        lines.append(bottom)
+        padded = (" " + l.ljust(max_len + 1, fill) for l in lines)
 
-        return "\n".join(lines)
+        return "\n".join((top, *padded, bottom))
 
-    @property
+    @cached_property
     def size(self):
+        # must split the same way as pad()
         return len(self.obj["text"].splitlines())
 
     def render(self):
@@ -115,32 +170,33 @@ class Codio(object):
     def speed(self):
         return self.obj["speed"]
 
-    @property
+    @cached_property
     def width(self):
         _width = 0
-        _terminal_width = int(shutil.get_terminal_size()[0] / 4)
+        _terminal_width = int(_term_size()[0] / 4)
 
         for l in self.obj["lines"]:
-            prompt = l.get("prompt", "")
-            inp = l.get("in", "")
-            out = l.get("out", "")
+            if l.get("progress") and _terminal_width > _width:
+                _width = _terminal_width
 
-            if l.get("progress") is not None and l["progress"]:
-                _magic_width = _terminal_width
-            else:
-                _magic_width = 0
+            prompt_width = len(l.get("prompt", ""))
+            if prompt_width > _width:
+                _width = prompt_width
+
+            # spaces are counted twice
+            inp = l.get("in", "")
+            inp_width = len(inp) + inp.count(" ")
+            if inp_width > _width:
+                _width = inp_width
 
-            _width = max(
-                _width,
-                _magic_width,
-                len(prompt),
-                len(inp) + inp.count(" "),
-                len(out) + out.count(" "),
-            )
+            out = l.get("out", "")
+            out_width = len(out) + out.count(" ")
+            if out_width > _width:
+                _width = out_width
 
         return _width + 4
 
-    @property
+    @cached_property
     def size(self):
         lines = len(self.obj["lines"])
 
@@ -191,18 +247,15 @@ class Codio(object):
         return _code
 
 
-@dataclass(init=False)
+@dataclass
 class Image(object):
-    def __init__(self, type: str = "image", obj: dict = None):
-        self.type = type
-        self.obj = obj
-        if not os.path.exists(self.obj["src"]):
-            raise FileNotFoundError(f"{self.obj['src']} does not exist")
+    type: str = "image"
+    obj: dict = None
 
     @property
     def size(self):
         # TODO: Support small, medium, large image sizes
-        return int(shutil.get_terminal_size()[1] / 2)
+        return int(_term_size()[1] / 2)
 
     def render(self):
         raise NotImplementedError
@@ -217,15 +270,24 @@ class BlockHtml(object):
     def size(self):
         raise NotImplementedError
 
-    @property
+    @cached_property
     def style(self):
-        _style = re.findall(r"((\w+)=(\w+))", self.obj["text"])
-        return {s[1]: s[2] for s in _style}
+        return {m.group(1): m.group(2) for m in _STYLE_RE.finditer(self.obj["text"])}
 
     def render(self):
         raise NotImplementedError
 
 
+ELEMENT_TYPES = {
+    "heading": Heading,
+    "text": Text,
+    "list": List,
+    "block_code": BlockCode,
+    "image": Image,
+    "block_html": BlockHtml,
+}
+
+
 class Slide(object):
     def __init__(self, elements=None):
         self.elements = elements
@@ -242,43 +304,46 @@ class Slide(object):
         # TODO: style should always be the first element on a slide
         # raise error if it isn't
 
+        style = {}
         for e in elements:
-            if e.type == "html":
+            t = e.type
+            if t == "html":
                 self.has_style = True
-                self.style = e.style
-
-            if e.type == "image":
+                style = e.style
+            elif t == "image":
                 self.has_image = True
-
-            if e.type == "code":
+            elif t == "code":
                 self.has_code = True
-
-            if e.type == "codio":
+            elif t == "codio":
                 self.has_codio = True
 
+        self.style = style
+
         # TODO: support everything!
 
-        if self.style.get("effect") is not None:
-            if self.style["effect"] not in EFFECTS:
-                raise ValueError(f"Effect {self.style['effect']} is not supported")
+        effect = style.get("effect")
+        fg = style.get("fg")
+        bg = style.get("bg")
+
+        if effect is not None:
+            if effect not in EFFECTS:
+                raise ValueError(f"Effect {effect} is not supported")
             self.has_effect = True
-            self.effect = self.style["effect"]
-
-        if self.style.get("fg") is not None:
-            try:
-                self.fg_color = COLORMAP[self.style["fg"]]
-            except KeyError:
-                raise ValueError(f"Color {self.style['fg']} is not supported")
-
-        if self.style.get("bg") is not None:
-            try:
-                self.bg_color = COLORMAP[self.style["bg"]]
-            except KeyError:
-                raise ValueError(f"Color {self.style['bg']} is not supported")
-
-        if self.has_effect and (
-            self.style.get("fg") is not None or self.style.get("bg") is not None
-        ):
+            self.effect = effect
+
+        if fg is not None:
+            fg_color = COLORMAP.get(fg)
+            if fg_color is None:
+                raise ValueError(f"Color {fg} is not supported")
+            self.fg_color = fg_color
+
+        if bg is not None:
+            bg_color = COLORMAP.get(bg)
+            if bg_color is None:
+                raise ValueError(f"Color {bg} is not supported")
+            self.bg_color = bg_color
+
+        if self.has_effect and (fg is not None or bg is not None):
             raise ValueError("Effects and colors on the same slide are not supported")
 
         if self.has_effect and self.has_code:
@@ -296,48 +361,50 @@ class Markdown(object):
     """
 
     def parse(self, text):
+        # codio files are only shared within a single parse, so edits show up
+        # the next time the deck is parsed
+        _load_codio.cache_clear()
+
         slides = []
-        ast = markdown(text, renderer="ast")
+        ast = _parse_ast(text)
 
         sliden = 0
         buffer = []
-        for i, obj in enumerate(ast):
-            if obj["type"] in ["newline"]:
+        for obj in ast:
+            obj_type = obj["type"]
+            if obj_type == "newline":
                 continue
 
-            if obj["type"] == "thematic_break" and buffer:
+            if obj_type == "thematic_break" and buffer:
                 slides.append(Slide(elements=buffer))
                 sliden += 1
                 buffer = []
                 continue
 
-            if obj["type"] == "paragraph":
+            if obj_type == "paragraph":
                 for child in obj["children"]:
-                    try:
-                        if child["type"] == "image" and child["alt"] == "codio":
-                            with open(child["src"], "r") as f:
-                                codio = yaml.load(f, Loader=yaml.Loader)
-                            buffer.append(Codio(obj=codio))
-                        else:
-                            element_name = child["type"].title().replace("_", "")
-                            Element = eval(element_name)
-                            buffer.append(Element(obj=child))
-                    except NameError:
-                        raise ValueError(
-                            f"(Slide {sliden + 1}) {element_name} is not supported"
-                        )
+                    child_type = child["type"]
+                    if child_type == "image" and child["alt"] == "codio":
+                        codio = _load_codio(os.path.abspath(child["src"]))
+                        buffer.append(Codio(obj=codio))
+                    else:
+                        try:
+                            Element = ELEMENT_TYPES[child_type]
+                        except KeyError:
+                            raise ValueError(
+                                f"(Slide {sliden + 1}) {child_type} is not supported"
+                            )
+                        buffer.append(Element(obj=child))
             else:
                 try:
-                    element_name = obj["type"].title().replace("_", "")
-                    Element = eval(element_name)
-                except NameError:
+                    Element = ELEMENT_TYPES[obj_type]
+                except KeyError:
                     raise ValueError(
-                        f"(Slide {sliden + 1}) {element_name} is not supported"
+                        f"(Slide {sliden + 1}) {obj_type} is not supported"
                     )
                 buffer.append(Element(obj=obj))
 
-            if i == len(ast) - 1:
-                slides.append(Slide(elements=buffer))
-                sliden += 1
+        if buffer:
+            slides.append(Slide(elements=buffer))
 
         return slides
@@ -21,6 +21,7 @@ from .effects import (
     _plasma,
     Codio,
 )
+from .markdown import reset_terminal_size
 
 
 class Slide(Scene):
@@ -193,6 +194,7 @@ class Slideshow(object):
                 a = time.time()
                 self.screen.draw_next_frame(repeat=repeat)
                 if self.screen.has_resized():
+                    reset_terminal_size()
                     if stop_on_resize:
                         self.screen._scenes[self.screen._scene_index].exit()
                         raise ResizeScreenError(